@@ -21,6 +21,22 @@ class ProcessData:
         df = pd.json_normalize(raw_data)
         return df
 
+    def flatten_record(self, item, prefix=""):
+        """
+        Flatten one raw Spotify JSON object the same way json_normalize does,
+        without building a DataFrame, so records can be streamed one at a time.
+        """
+        record = {}
+        for key, value in item.items():
+            name = f"{prefix}{key}"
+            if isinstance(value, dict): # empty dicts are dropped, as json_normalize does
+                record.update(self.flatten_record(value, prefix=f"{name}."))
+            elif isinstance(value, float) and value != value: # NaN -> None
+                record[name] = None
+            else:
+                record[name] = value
+        return record
+
 
 class UserAnalytics:
     def __init__(self, access_token: str):
@@ -69,6 +85,41 @@ class UserAnalytics:
         cleaned = clean_json(records)
         return cleaned
 
+    # ---------------- STREAMING ----------------
+    async def streamTopTracks(self, n=20, page_size=50):
+        offset = 0
+        while offset < n:
+            limit = min(page_size, n - offset)
+            data = await self.proxy.fetch_api(
+                "me/top/tracks",
+                params={"limit": limit, "offset": offset},
+            )
+            tracks = data.get("items", [])
+            for track in tracks:
+                yield self.process.flatten_record(track)
+
+            if len(tracks) < limit or not data.get("next"): # no more pages
+                break
+            offset += len(tracks)
+
+    async def streamRecentlyPlayed(self, n=50, page_size=50):
+        before = int(datetime.now().timestamp() * 1000)
+        sent = 0
+        while sent < n:
+            limit = min(page_size, n - sent)
+            data = await self.proxy.fetch_api(
+                "me/player/recently-played",
+                params={"limit": limit, "before": before},
+            )
+            plays = data.get("items", [])
+            for play in plays:
+                yield self.process.flatten_record(play)
+            sent += len(plays)
+
+            before = (data.get("cursors") or {}).get("before")
+            if len(plays) < limit or not before: # no more history
+                break
+
     # ---------------- TOP GENRES ----------------
     async def getTopGenres(self, n=50):
         records = await self.getTopArtists(n=n)
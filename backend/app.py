@@ -1,7 +1,10 @@
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Depends
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
+import json
 from spotify_api import SpotifyAPI, SpotifyAPIProxy
 from analytics import UserAnalytics
+from auth import get_session, hash_token
 
 user_tokens = {}
 
@@ -22,6 +25,31 @@ app.add_middleware(
 )
 
 
+# Stream records one JSON object per line as they arrive
+async def ndjson(records):
+    async for record in records:
+        yield json.dumps(record) + "\n"
+
+def ndjson_response(records):
+    return StreamingResponse(ndjson(records), media_type="application/x-ndjson")
+
+MAX_STREAM_ITEMS = 1000
+
+# Validate "n" before streaming, since errors after the headers are sent can't be reported
+def parse_count(value, default):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return None
+    try:
+        n = int(value)
+    except (TypeError, ValueError):
+        return None
+    if n <= 0:
+        return None
+    return min(n, MAX_STREAM_ITEMS)
+
+
 # Basic root endpoint
 @app.get("/")
 def root():
@@ -34,15 +62,17 @@ def get_data():
 
 # RECEIVE FRESH TOKEN FROM FRONTEND
 @app.post("/api/token")
-async def receive_token(request: Request):
-    data = await request.json()
-    token = data.get("accessToken")
+async def receive_token(session: dict = Depends(get_session)):
+    token = session["token"]
 
     print("\n--- /api/token RECEIVED ---")
-    print("Token:", token)
 
     if not token:
         return {"error": "token not found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
+
+    print("Token hash:", hash_token(token)[:12], "User:", session["user_id"])
 
     user_tokens["active"] = token
     print("Stored token successfully.")
@@ -50,24 +80,33 @@ async def receive_token(request: Request):
 
 # SEND TOP TRACKS TO FRONTEND
 @app.post("/api/top-tracks")
-async def get_top_tracks(request: Request): 
-    data = await request.json()
-    token = data.get("accessToken")
+async def get_top_tracks(session: dict = Depends(get_session)): 
+    data = session["data"]
+    token = session["token"]
     if not token:
         return {"error": "no active token found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
 
     analytics = UserAnalytics(access_token=token)
+    if data.get("stream"):
+        n = parse_count(data.get("n"), default=20)
+        if n is None:
+            return {"error": "n must be a positive integer"}
+        return ndjson_response(analytics.streamTopTracks(n=n))
+
     top_tracks = await analytics.getTopTracks(n=20)
 
     return {"top_tracks": top_tracks}
 
 # SEND TOP ARTISTS TO FRONTEND
 @app.post("/api/top-artists")
-async def get_top_artists(request: Request): 
-    data = await request.json()
-    token = data.get("accessToken")
+async def get_top_artists(session: dict = Depends(get_session)): 
+    token = session["token"]
     if not token:
         return {"error": "no active token found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
 
     analytics = UserAnalytics(access_token=token)
     top_artists = await analytics.getTopArtists(n=20)
@@ -76,24 +115,33 @@ async def get_top_artists(request: Request):
 
 # SEND RECENTLY PLAYED TO FRONTEND
 @app.post("/api/recently-played")
-async def get_recently_played(request: Request): 
-    data = await request.json()
-    token = data.get("accessToken")
+async def get_recently_played(session: dict = Depends(get_session)): 
+    data = session["data"]
+    token = session["token"]
     if not token:
         return {"error": "no active token found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
 
     analytics = UserAnalytics(access_token=token)
+    if data.get("stream"):
+        n = parse_count(data.get("n"), default=50)
+        if n is None:
+            return {"error": "n must be a positive integer"}
+        return ndjson_response(analytics.streamRecentlyPlayed(n=n))
+
     recently_played = await analytics.getRecentlyPlayed(n=50)
 
     return {"recently_played": recently_played}
 
 # SEND TOP GENRES TO FRONTEND
 @app.post("/api/top-genres")
-async def get_top_genres(request: Request): 
-    data = await request.json()
-    token = data.get("accessToken")
+async def get_top_genres(session: dict = Depends(get_session)): 
+    token = session["token"]
     if not token:
         return {"error": "no active token found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
 
     analytics = UserAnalytics(access_token=token)
     top_genres = await analytics.getTopGenres(n=50)
@@ -102,11 +150,12 @@ async def get_top_genres(request: Request):
 
 # SEND QUICK STATS TO FRONTEND
 @app.post("/api/quick-stats")
-async def get_quick_stats(request: Request): 
-    data = await request.json()
-    token = data.get("accessToken")
+async def get_quick_stats(session: dict = Depends(get_session)): 
+    token = session["token"]
     if not token:
         return {"error": "no active token found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
 
     analytics = UserAnalytics(access_token=token)
     quick_stats = await analytics.getQuickStats()
@@ -115,11 +164,12 @@ async def get_quick_stats(request: Request):
 
 # SEND SONG RECOMMENDATIONS TO FRONTEND
 @app.post("/api/recommendations")
-async def get_song_recommendations(request: Request): 
-    data = await request.json()
-    token = data.get("accessToken")
+async def get_song_recommendations(session: dict = Depends(get_session)): 
+    token = session["token"]
     if not token:
         return {"error": "no active token found"}
+    if not session["user_id"]:
+        return {"error": "invalid or expired token"}
 
     analytics = UserAnalytics(access_token=token)
     recommendations = await analytics.getSongRecommendations(n=20)
@@ -0,0 +1,84 @@
+import asyncio
+import hashlib
+import time
+from typing import Dict, Any, Optional
+from fastapi import Request
+from spotify_api import SpotifyAPI, SpotifyAPIProxy
+
+TOKEN_LIFETIME = 3600 # Spotify access tokens expire after one hour
+FAILURE_LIFETIME = 30 # retry unresolvable tokens after this many seconds
+
+def hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+class TokenResolver:
+    def __init__(self, lifetime: float = TOKEN_LIFETIME, failure_lifetime: float = FAILURE_LIFETIME):
+        self.lifetime = lifetime
+        self.failure_lifetime = failure_lifetime
+        self.cache = {} # token hash -> {"user_id", "expires"}, user_id None for failed lookups
+        self.pending = {} # token hash -> in-flight "me" lookup
+        pass
+
+    async def resolve(self, token: str, expires_at: Optional[float] = None) -> Optional[str]:
+        """
+        Maps an access token to its Spotify user id, calling "me" only once per token.
+        :param token: Spotify OAuth access token
+        :param expires_at: Token expiry in epoch milliseconds, if the frontend sent it (untrusted)
+        :return: Spotify user id, or None if the token could not be resolved
+        """
+        if not token:
+            return None
+
+        key = hash_token(token)
+        entry = self.cache.get(key)
+        if entry and entry["expires"] > time.time(): # fast path, no upstream call
+            return entry["user_id"]
+
+        if key not in self.pending: # share one lookup between concurrent requests
+            task = asyncio.create_task(self._fetch_user_id(token))
+            task.add_done_callback(lambda _: self.pending.pop(key, None))
+            self.pending[key] = task
+        # a cancelled request must not cancel the lookup for other waiters
+        user_id = await asyncio.shield(self.pending[key])
+
+        if user_id:
+            expires = time.time() + self.lifetime
+            if isinstance(expires_at, (int, float)) and not isinstance(expires_at, bool):
+                expires = min(expires, expires_at / 1000) # never trust the client beyond the token lifetime
+        else: # briefly remember failures so bad/expired tokens don't hit "me" on every request
+            expires = time.time() + self.failure_lifetime
+        self.evict_expired()
+        self.cache[key] = {"user_id": user_id, "expires": expires}
+        return user_id
+
+    async def _fetch_user_id(self, token: str) -> Optional[str]:
+        proxy = SpotifyAPIProxy(SpotifyAPI(token))
+        data = await proxy.fetch_api("me")
+        return data.get("id")
+
+    def evict_expired(self):
+        now = time.time()
+        for key in [k for k, v in self.cache.items() if v["expires"] <= now]:
+            del self.cache[key]
+
+
+resolver = TokenResolver()
+
+async def get_session(request: Request) -> Dict[str, Any]:
+    """
+    FastAPI dependency: parses the JSON body once and resolves the caller's user id.
+    :return: {"token", "user_id", "data"} where data is the parsed request body
+    """
+    try:
+        data = await request.json()
+    except Exception:
+        data = {}
+    if not isinstance(data, dict):
+        data = {}
+
+    token = data.get("accessToken")
+    if not isinstance(token, str):
+        token = None
+    user_id = await resolver.resolve(token, data.get("expiresAt"))
+    return {"token": token, "user_id": user_id, "data": data}
@@ -4,6 +4,10 @@ import time
 from typing import Dict, Any, Optional
 import copy
 import httpx
+import asyncio
+import re
+
+SPOTIFY_ID = re.compile(r"^[0-9A-Za-z]{22}$") # base62, 22 chars
 
 class APIInterface(ABC):
     @abstractmethod
@@ -16,6 +20,10 @@ class SpotifyAPIProxy(APIInterface):
         self.cache = {}
         self.base_url = "https://api.spotify.com/v1"
         self.access_token = self.api.get_token()
+        self.batch_size = 50 # Spotify's max ids per multi-id request
+        self.batch_window = 0.01 # seconds to collect ids before flushing
+        self.pending = {} # kind -> {id: future}
+        self.flush_tasks = {} # kind -> scheduled flush task
         pass
     
     async def fetch_api(self, endpoint, headers=None, method="GET", data=None, params=None) -> Dict[str, Any]:
@@ -41,7 +49,7 @@ class SpotifyAPIProxy(APIInterface):
                 "Content-Type": "application/json"
                 }
 
-            if isCached and "ETag" in isCached: # check if url is already cached
+            if isCached and isCached.get("ETag"): # check if url is already cached
                 headers["If-None-Match"] = isCached["ETag"] # notify Spotify api that url is cached
             
             response = await self.api.fetch_api(endpoint, headers, method, data, params)
@@ -66,6 +74,86 @@ class SpotifyAPIProxy(APIInterface):
             print(f"API cache search failed: {e}")
             return {} # return empty dict on failure
 
+    async def fetch_item(self, kind, item_id) -> Dict[str, Any]:
+        """
+        Queues a single track/artist lookup to be sent with other ids in one multi-id request.
+        :param kind: Spotify multi-id endpoint ("tracks" or "artists")
+        :param item_id: Spotify id of the track or artist
+        :return: Parsed JSON object for the id ({} if not found)
+        """
+        if not isinstance(item_id, str) or not SPOTIFY_ID.match(item_id):
+            # Spotify rejects the whole multi-id request if any id is malformed
+            print(f"Skipping invalid Spotify id: {item_id!r}")
+            return {}
+
+        url = f"{self.base_url}/{kind}/{item_id}"
+        isCached = self.cache.get(url)
+        if isCached: # skip network if id was already fetched
+            return isCached["data"]
+
+        pending = self.pending.setdefault(kind, {})
+        if item_id not in pending: # share one future between duplicate lookups
+            pending[item_id] = asyncio.get_running_loop().create_future()
+        future = pending[item_id]
+
+        if kind not in self.flush_tasks: # first lookup in this window schedules the flush
+            self.flush_tasks[kind] = asyncio.create_task(self._flush_after_window(kind))
+
+        return await asyncio.shield(future) # a cancelled caller must not cancel other awaiters
+
+    async def fetch_tracks(self, ids) -> list:
+        return await asyncio.gather(*(self.fetch_item("tracks", i) for i in ids))
+
+    async def fetch_artists(self, ids) -> list:
+        return await asyncio.gather(*(self.fetch_item("artists", i) for i in ids))
+
+    async def _flush_after_window(self, kind):
+        await asyncio.sleep(self.batch_window)
+        self.flush_tasks.pop(kind, None)
+        pending = self.pending.pop(kind, {})
+
+        ids = list(pending)
+        chunks = [ids[i:i + self.batch_size] for i in range(0, len(ids), self.batch_size)]
+        await asyncio.gather(*(self._fetch_chunk(kind, chunk, pending) for chunk in chunks))
+
+    async def _fetch_chunk(self, kind, chunk, pending):
+        """
+        Calls a multi-id endpoint for one chunk of ids and resolves each id's future.
+        """
+        results = {}
+        try:
+            access_token = self.access_token
+            if not access_token:
+                raise Exception('Access token not found. Unable to call on behalf of user.')
+
+            headers = {
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json"
+                }
+
+            response = await self.api.fetch_api(kind, headers, "GET", None, {"ids": ",".join(chunk)})
+
+            if response is None:
+                raise Exception('API response empty')
+
+            for item in response.json().get(kind, []):
+                if item and item.get("id"): # Spotify returns null for unknown ids
+                    results[item["id"]] = item
+                    self.cache[f"{self.base_url}/{kind}/{item['id']}"] = {
+                                "ETag": None,
+                                "data": item,
+                                "timestamp": time.time()
+                                }
+
+        except Exception as e:
+            print(f"API batch fetch failed: {e}")
+
+        finally:
+            for item_id in chunk:
+                future = pending[item_id]
+                if not future.done():
+                    future.set_result(results.get(item_id, {})) # empty dict on failure
+
     def get_cache(self):
         return copy.deepcopy(self.cache)
 
@@ -121,3 +209,4 @@ class SpotifyAPI(APIInterface):
 # api = SpotifyAPI(token='token1234')
 # proxy = SpotifyAPIProxy(api=api)
 # user_data = proxy.fetch_api(endpoint="me")
+# artists = proxy.fetch_artists(["artist_id_1", "artist_id_2"])
@@ -51,6 +51,14 @@ class TestProcessData(unittest.TestCase):
         self.assertIn("name", df.columns)
         self.assertEqual(df.iloc[0]["name"], "Tyler")
 
+    def test_flatten_record_matches_flatten_data(self):
+        raw = {"name": "Tyler", "followers": {"total": 999}, "genres": [], "score": float("nan"),
+               "images": {}, "external": {"urls": {}, "id": 1}}
+        record = self.process.flatten_record(raw)
+        self.assertEqual(record, {"name": "Tyler", "followers.total": 999, "genres": [], "score": None,
+                                  "external.id": 1})
+        self.assertEqual(set(record), set(self.process.flatten_data([raw]).columns))
+
 
 # ----------------------------------------------------
 #      Test: UserAnalytics
@@ -126,6 +134,40 @@ class TestUserAnalytics(unittest.IsolatedAsyncioTestCase):
         result = await self.ua.getRecentlyPlayed(n=1)
         self.assertEqual(len(result), 1)
 
+    # ----------------------------------------------------
+    #   Streaming
+    # ----------------------------------------------------
+    async def test_stream_top_tracks(self):
+        result = [r async for r in self.ua.streamTopTracks(n=2)]
+        self.assertEqual([r["id"] for r in result], ["track1", "track2"])
+
+    async def test_stream_top_tracks_pages(self):
+        pages = [
+            {"items": [{"id": "t1"}, {"id": "t2"}], "next": "page2"},
+            {"items": [{"id": "t3"}, {"id": "t4"}], "next": None},
+        ]
+        self.ua.proxy.fetch_api = AsyncMock(side_effect=pages)
+
+        result = [r async for r in self.ua.streamTopTracks(n=10, page_size=2)]
+
+        self.assertEqual([r["id"] for r in result], ["t1", "t2", "t3", "t4"])
+        self.assertEqual(self.ua.proxy.fetch_api.await_count, 2)  # stops when "next" is missing
+        second_params = self.ua.proxy.fetch_api.call_args_list[1].kwargs["params"]
+        self.assertEqual(second_params, {"limit": 2, "offset": 2})
+
+    async def test_stream_recently_played_pages(self):
+        pages = [
+            {"items": [{"track": {"id": "a"}}, {"track": {"id": "b"}}], "cursors": {"before": "100"}},
+            {"items": [{"track": {"id": "c"}}], "cursors": {"before": "50"}},
+        ]
+        self.ua.proxy.fetch_api = AsyncMock(side_effect=pages)
+
+        result = [r async for r in self.ua.streamRecentlyPlayed(n=3, page_size=2)]
+
+        self.assertEqual([r["track.id"] for r in result], ["a", "b", "c"])
+        second_params = self.ua.proxy.fetch_api.call_args_list[1].kwargs["params"]
+        self.assertEqual(second_params, {"limit": 1, "before": "100"})
+
     # ----------------------------------------------------
     #   Top Genres
     # ----------------------------------------------------
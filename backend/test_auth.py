@@ -0,0 +1,140 @@
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+import time
+import asyncio
+
+from auth import TokenResolver, hash_token, get_session
+
+
+# ───────────────────────────────────────────────
+#              TEST: TokenResolver
+# ───────────────────────────────────────────────
+class TestTokenResolver(unittest.IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        """Resolver with the upstream "me" lookup mocked out."""
+        self.resolver = TokenResolver()
+        self.resolver._fetch_user_id = AsyncMock(return_value="user1")
+
+    async def slow_fetch(self, token):
+        await asyncio.sleep(0.01)
+        return "user1"
+
+    async def test_resolve_calls_me_once_per_token(self):
+        """Test that repeated lookups share one upstream call."""
+        first = await self.resolver.resolve("TOKEN")
+        second = await self.resolver.resolve("TOKEN")
+
+        self.assertEqual(first, "user1")
+        self.assertEqual(second, "user1")
+        self.resolver._fetch_user_id.assert_awaited_once_with("TOKEN")
+
+    async def test_resolve_concurrent_lookups_share_one_call(self):
+        """Test that concurrent lookups for one token share the in-flight call."""
+        self.resolver._fetch_user_id = AsyncMock(side_effect=self.slow_fetch)
+
+        result = await asyncio.gather(self.resolver.resolve("TOKEN"), self.resolver.resolve("TOKEN"))
+
+        self.assertEqual(result, ["user1", "user1"])
+        self.resolver._fetch_user_id.assert_awaited_once_with("TOKEN")
+        self.assertEqual(self.resolver.pending, {})
+
+    async def test_resolve_cancel_does_not_affect_other_waiters(self):
+        """Test that cancelling one request doesn't cancel the shared lookup."""
+        self.resolver._fetch_user_id = AsyncMock(side_effect=self.slow_fetch)
+
+        first = asyncio.create_task(self.resolver.resolve("TOKEN"))
+        second = asyncio.create_task(self.resolver.resolve("TOKEN"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "user1")
+        with self.assertRaises(asyncio.CancelledError):
+            await first
+        self.assertEqual(self.resolver.pending, {})
+
+    async def test_resolve_stores_only_hashed_tokens(self):
+        """Test that the raw token is never used as a cache key."""
+        await self.resolver.resolve("TOKEN")
+
+        self.assertNotIn("TOKEN", self.resolver.cache)
+        self.assertIn(hash_token("TOKEN"), self.resolver.cache)
+
+    async def test_resolve_refetches_after_expiry(self):
+        """Test that an expired token is resolved again."""
+        expired = (time.time() - 1) * 1000
+        await self.resolver.resolve("TOKEN", expires_at=expired)
+        await self.resolver.resolve("TOKEN")
+
+        self.assertEqual(self.resolver._fetch_user_id.await_count, 2)
+
+    async def test_resolve_ignores_untrusted_expiry(self):
+        """Test that non-numeric expiresAt is ignored and far-future values are clamped."""
+        before = time.time()
+        await self.resolver.resolve("T1", expires_at="123")
+        await self.resolver.resolve("T2", expires_at=10 ** 15)
+        after = time.time()
+
+        for token in ("T1", "T2"):
+            expires = self.resolver.cache[hash_token(token)]["expires"]
+            self.assertGreaterEqual(expires, before + self.resolver.lifetime)
+            self.assertLessEqual(expires, after + self.resolver.lifetime)
+
+    async def test_resolve_missing_or_invalid_token(self):
+        """Test that missing tokens and failed lookups return None."""
+        self.assertIsNone(await self.resolver.resolve(None))
+        self.resolver._fetch_user_id.assert_not_awaited()
+
+        self.resolver._fetch_user_id.return_value = None
+        self.assertIsNone(await self.resolver.resolve("BAD"))
+
+    async def test_resolve_caches_failures_briefly(self):
+        """Test that a failed lookup isn't retried until the failure entry expires."""
+        self.resolver._fetch_user_id.return_value = None
+
+        self.assertIsNone(await self.resolver.resolve("BAD"))
+        self.assertIsNone(await self.resolver.resolve("BAD"))
+        self.resolver._fetch_user_id.assert_awaited_once_with("BAD")
+
+        entry = self.resolver.cache[hash_token("BAD")]
+        self.assertLessEqual(entry["expires"], time.time() + self.resolver.failure_lifetime)
+
+        entry["expires"] = time.time() - 1 # failure entry expired
+        self.resolver._fetch_user_id.return_value = "user1"
+        self.assertEqual(await self.resolver.resolve("BAD"), "user1")
+
+
+# ───────────────────────────────────────────────
+#              TEST: get_session
+# ───────────────────────────────────────────────
+class TestGetSession(unittest.IsolatedAsyncioTestCase):
+
+    def make_request(self, body):
+        request = MagicMock()
+        request.json = AsyncMock(return_value=body)
+        return request
+
+    @patch("auth.resolver")
+    async def test_non_string_token_treated_as_missing(self, mock_resolver):
+        """Test that a non-string accessToken is treated as missing instead of crashing."""
+        mock_resolver.resolve = AsyncMock(return_value=None)
+
+        for token in (123, ["x"], {"a": 1}):
+            session = await get_session(self.make_request({"accessToken": token}))
+            self.assertIsNone(session["token"])
+            self.assertIsNone(session["user_id"])
+            mock_resolver.resolve.assert_awaited_with(None, None)
+
+    @patch("auth.resolver")
+    async def test_session_includes_user_id(self, mock_resolver):
+        """Test that the session carries the token, resolved user id and body."""
+        mock_resolver.resolve = AsyncMock(return_value="user1")
+        body = {"accessToken": "TOKEN", "stream": True}
+
+        session = await get_session(self.make_request(body))
+
+        self.assertEqual(session, {"token": "TOKEN", "user_id": "user1", "data": body})
+
+
+if __name__ == "__main__":
+    unittest.main()
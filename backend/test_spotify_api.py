@@ -3,6 +3,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import time
 import httpx
 import copy
+import asyncio
 
 from spotify_api import SpotifyAPIProxy, SpotifyAPI, APIInterface
 
@@ -91,6 +92,89 @@ class TestSpotifyAPIProxy(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(result, {"updated": True})
         self.assertEqual(self.proxy.cache[cached_url]["ETag"], "NEW123")
 
+    async def test_fetch_tracks_batches_into_one_request(self):
+        """Test that concurrent id lookups are sent as one multi-id request."""
+        a, b = "a" * 22, "b" * 22
+        batch_resp = MagicMock()
+        batch_resp.json.return_value = {"tracks": [{"id": a}, {"id": b}]}
+        self.mock_api.fetch_api.return_value = batch_resp
+
+        result = await self.proxy.fetch_tracks([a, b, a])
+
+        self.assertEqual(result, [{"id": a}, {"id": b}, {"id": a}])
+        self.mock_api.fetch_api.assert_awaited_once()
+        params = self.mock_api.fetch_api.call_args.args[4]
+        self.assertEqual(params, {"ids": f"{a},{b}"})
+
+    async def test_fetch_artists_chunks_by_batch_size(self):
+        """Test that more than 50 ids are split into chunks of 50."""
+        async def fake_fetch(endpoint, headers, method, data, params):
+            resp = MagicMock()
+            resp.json.return_value = {"artists": [{"id": i} for i in params["ids"].split(",")]}
+            return resp
+        self.mock_api.fetch_api.side_effect = fake_fetch
+
+        ids = [f"{i:022d}" for i in range(120)]
+        result = await self.proxy.fetch_artists(ids)
+
+        self.assertEqual([r["id"] for r in result], ids)
+        self.assertEqual(self.mock_api.fetch_api.await_count, 3)
+
+    async def test_fetch_item_uses_cache(self):
+        """Test that cached ids skip the network and missing ids return {}."""
+        a, missing = "a" * 22, "m" * 22
+        self.proxy.cache[f"https://api.spotify.com/v1/tracks/{a}"] = {
+            "ETag": None,
+            "data": {"id": a},
+            "timestamp": time.time(),
+        }
+        batch_resp = MagicMock()
+        batch_resp.json.return_value = {"tracks": [None]}
+        self.mock_api.fetch_api.return_value = batch_resp
+
+        result = await self.proxy.fetch_tracks([a, missing])
+
+        self.assertEqual(result, [{"id": a}, {}])
+        params = self.mock_api.fetch_api.call_args.args[4]
+        self.assertEqual(params, {"ids": missing})
+
+    async def test_fetch_item_skips_invalid_ids(self):
+        """Test that malformed ids are never sent, so they can't fail the whole chunk."""
+        a = "a" * 22
+        batch_resp = MagicMock()
+        batch_resp.json.return_value = {"tracks": [{"id": a}]}
+        self.mock_api.fetch_api.return_value = batch_resp
+
+        result = await self.proxy.fetch_tracks([a, "bad id!", None])
+
+        self.assertEqual(result, [{"id": a}, {}, {}])
+        params = self.mock_api.fetch_api.call_args.args[4]
+        self.assertEqual(params, {"ids": a})
+
+    async def test_fetch_item_failed_response(self):
+        """Test that every id in a failed chunk resolves to {} and nothing is cached."""
+        self.mock_api.fetch_api.return_value = None
+
+        result = await self.proxy.fetch_tracks(["a" * 22, "b" * 22])
+
+        self.assertEqual(result, [{}, {}])
+        self.assertEqual(self.proxy.cache, {})
+
+    async def test_fetch_item_cancel_does_not_affect_other_awaiters(self):
+        """Test that cancelling one caller doesn't cancel a shared duplicate lookup."""
+        a = "a" * 22
+        batch_resp = MagicMock()
+        batch_resp.json.return_value = {"tracks": [{"id": a}]}
+        self.mock_api.fetch_api.return_value = batch_resp
+
+        first = asyncio.create_task(self.proxy.fetch_item("tracks", a))
+        second = asyncio.create_task(self.proxy.fetch_item("tracks", a))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, {"id": a})
+        with self.assertRaises(asyncio.CancelledError):
+            await first
 
 # ───────────────────────────────────────────────
 #                    TEST: SpotifyAPI